@@ -1,14 +1,25 @@
 import random
+import re
+import signal
+import sys
+import contextvars
 import functools
+import inspect
 import time
 import json
 import os
 import logging
+import urllib.parse
+import urllib.request
+from contextlib import contextmanager, nullcontext
+from http import HTTPStatus
 
-import boto3
+import orjson
 import psycopg2
+import psycopg2.extensions
+import psycopg2.pool
 from psycopg2.extras import RealDictCursor
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request
 import aws_lambda_wsgi
 
 # ---------------------------------------------------------------------------
@@ -16,14 +27,41 @@ import aws_lambda_wsgi
 # ---------------------------------------------------------------------------
 logger_provider = None
 meter = None
+tracer = None
+otel_context = None
+# Whether instruments take context= (newer APIs), used to keep exemplars
+# linked to the span a deferred measurement was taken in.
+_METRICS_ACCEPT_CONTEXT = False
 
 WORKLOAD = "books-flask"
 
 try:
     from opentelemetry import trace, metrics
+    from opentelemetry import context as otel_context
+
+    _METRICS_ACCEPT_CONTEXT = (
+        "context" in inspect.signature(metrics.Histogram.record).parameters
+    )
+
+    # --- Metrics ---
+    meter = metrics.get_meter(WORKLOAD, "2.0.0")
+
+    # --- Traces ---
+    tracer = trace.get_tracer(WORKLOAD, "2.0.0")
+
+    OPENTELEMETRY_AVAILABLE = True
+
+except ImportError as e:
+    print(f"OpenTelemetry not available: {e}")
+    OPENTELEMETRY_AVAILABLE = False
+
+# --- Logs ---
+# Log export has its own import guard so a layer without grpc still gets
+# metrics and traces; it falls back to the OTLP/HTTP exporter on 4318.
+otel_handler = None
+try:
     from opentelemetry.sdk._logs import LoggerProvider, LoggingHandler
     from opentelemetry.sdk._logs.export import BatchLogRecordProcessor
-    from opentelemetry.exporter.otlp.proto.http._log_exporter import OTLPLogExporter
     from opentelemetry.sdk.resources import Resource
 
     resource = Resource.create({
@@ -31,38 +69,86 @@ try:
         "service.version": os.environ.get("OTEL_SERVICE_VERSION", "2.0.0"),
     })
 
-    # --- Logs ---
+    try:
+        from opentelemetry.exporter.otlp.proto.grpc._log_exporter import OTLPLogExporter
+    except ImportError as e:
+        print(f"OTLP gRPC log exporter not available, using OTLP/HTTP: {e}")
+        from opentelemetry.exporter.otlp.proto.http._log_exporter import OTLPLogExporter
+
+        log_exporter = OTLPLogExporter(endpoint="http://localhost:4318/v1/logs", timeout=2)
+    else:
+        # gRPC keeps one HTTP/2 channel to the collector extension open (kept
+        # warm with keepalive pings between export intervals); batching
+        # is tuned so most warm invocations leave records queued (see
+        # lambda_handler) instead of forcing an export round trip each time.
+        try:
+            log_exporter = OTLPLogExporter(
+                endpoint="localhost:4317",
+                insecure=True,
+                timeout=2,
+                channel_options=(
+                    ("grpc.keepalive_time_ms", 30000),
+                    ("grpc.keepalive_timeout_ms", 5000),
+                ),
+            )
+        except TypeError:
+            # Exporter releases in older Lambda layers predate channel_options
+            log_exporter = OTLPLogExporter(endpoint="localhost:4317", insecure=True, timeout=2)
+
     logger_provider = LoggerProvider(resource=resource)
     logger_provider.add_log_record_processor(
         BatchLogRecordProcessor(
-            OTLPLogExporter(endpoint="http://localhost:4318/v1/logs")
+            log_exporter,
+            max_queue_size=int(os.environ.get("OTEL_BLRP_MAX_QUEUE_SIZE", "2048")),
+            max_export_batch_size=int(
+                os.environ.get("OTEL_BLRP_MAX_EXPORT_BATCH_SIZE", "512")
+            ),
+            schedule_delay_millis=int(os.environ.get("OTEL_BLRP_SCHEDULE_DELAY", "1000")),
+            export_timeout_millis=int(os.environ.get("OTEL_BLRP_EXPORT_TIMEOUT", "2000")),
         )
     )
     otel_handler = LoggingHandler(logger_provider=logger_provider)
 
-    # --- Metrics ---
-    meter = metrics.get_meter(WORKLOAD, "2.0.0")
-
-    OPENTELEMETRY_AVAILABLE = True
-
 except ImportError as e:
-    print(f"OpenTelemetry not available: {e}")
-    otel_handler = None
-    OPENTELEMETRY_AVAILABLE = False
+    print(f"OpenTelemetry log export not available: {e}")
 
 # ---------------------------------------------------------------------------
 # Logging configuration
 # ---------------------------------------------------------------------------
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    force=True,
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+_INVALID_LOG_LEVEL = None
+if LOG_LEVEL not in logging.getLevelNamesMapping():
+    _INVALID_LOG_LEVEL, LOG_LEVEL = LOG_LEVEL, "INFO"
+
+
+class _CachedTimeFormatter(logging.Formatter):
+    """Formatter that runs strftime for %(asctime)s at most once per second."""
+
+    _cached = (None, "")  # (epoch second, formatted timestamp)
+
+    def formatTime(self, record, datefmt=None):
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        cached_second, formatted = self._cached
+        if second != cached_second:
+            formatted = time.strftime(self.default_time_format, self.converter(second))
+            self._cached = (second, formatted)
+        return self.default_msec_format % (formatted, record.msecs)
+
+
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(
+    _CachedTimeFormatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 )
+logging.basicConfig(level=LOG_LEVEL, handlers=[_log_handler], force=True)
 
 if otel_handler:
     logging.getLogger().addHandler(otel_handler)
 
 logger = logging.getLogger(__name__)
+if _INVALID_LOG_LEVEL:
+    logger.warning("Unknown LOG_LEVEL %r, using INFO", _INVALID_LOG_LEVEL)
 
 # ---------------------------------------------------------------------------
 # Common label helpers
@@ -71,9 +157,14 @@ logger = logging.getLogger(__name__)
 BASE_LABELS = {"workload": WORKLOAD}
 
 
-def _labels(**kwargs):
-    """Merge base labels with per-call labels."""
-    return {**BASE_LABELS, **kwargs}
+@functools.lru_cache(maxsize=64)
+def _labels(items=()):
+    """Merge base labels with a tuple of (key, value) label pairs.
+
+    The merged dict is memoised per label set and shared between calls;
+    that is safe because the OTel metrics API only reads attributes.
+    """
+    return {**BASE_LABELS, **dict(items)}
 
 
 # ---------------------------------------------------------------------------
@@ -86,12 +177,18 @@ def _labels(**kwargs):
 #                     k8s workloads in groundcover dashboards
 #   db.system       — OTel semantic convention for database type
 #   db.operation    — OTel semantic convention: select/insert/update/delete
-#   http.method     — matches http_request_method on auto-instrumented metrics
-#   http.route      — matches http_route on auto-instrumented metrics;
-#                     uses Flask route patterns (e.g. /books/<id>)
-#   http.status_code— matches http_response_status_code convention
+#   operation       — book CRUD operation: list/get/create/update/delete
 #   error.type      — classification: validation, database_connection,
 #                     database_query, integrity_violation, health_check
+#   http.route      — Flask route template (e.g. /books/<int:book_id>); only
+#   http.method       on app.fast_path.duration, see below
+#
+# Custom metrics deliberately carry only bounded, low-cardinality labels.
+# http.route / http.method / http.status_code would multiply the series
+# count of every instrument. Per-route breakdowns come from the
+# auto-instrumented http_server_duration metric for requests that go
+# through Flask, and from app.fast_path.duration (one series per fixed
+# route/method pair) for requests lambda_handler serves without Flask.
 # ---------------------------------------------------------------------------
 if meter:
     db_connection_duration = meter.create_histogram(
@@ -108,7 +205,7 @@ if meter:
 
     app_error_counter = meter.create_counter(
         name="app.errors",
-        description="Application errors by type, route, and status code",
+        description="Application errors by type",
         unit="1",
     )
 
@@ -131,9 +228,15 @@ if meter:
 
     book_operations_counter = meter.create_counter(
         name="app.books.operations",
-        description="Book CRUD operations by type and route",
+        description="Book CRUD operations by type",
         unit="1",
     )
+
+    fast_path_duration = meter.create_histogram(
+        name="app.fast_path.duration",
+        description="Duration of requests served by the lambda_handler fast path",
+        unit="ms",
+    )
 else:
     db_connection_duration = None
     db_query_duration = None
@@ -142,6 +245,7 @@ else:
     latency_injection_duration = None
     books_result_count = None
     book_operations_counter = None
+    fast_path_duration = None
 
 
 # ---------------------------------------------------------------------------
@@ -149,6 +253,68 @@ else:
 # ---------------------------------------------------------------------------
 app = Flask(__name__)
 
+
+# ---------------------------------------------------------------------------
+# Request-scoped metric batching
+#
+# Measurements taken while handling a request are queued and handed to the
+# OTel SDK in one pass once the request finishes, rather than interleaving
+# SDK calls with request work. lambda_handler batches every invocation (fast
+# path and WSGI alike); the WSGI middleware covers local runs of the Flask
+# app. Outside a batch (e.g. module import) measurements are emitted
+# immediately.
+# ---------------------------------------------------------------------------
+_metric_batch = contextvars.ContextVar("metric_batch", default=None)
+
+
+def _emit(record, value, attributes):
+    """Queue ``record(value, attributes)`` for the current batch, if any.
+
+    The active OTel context is queued with it, so the measurement is still
+    attributed to the span it was taken in when the batch is flushed.
+    """
+    batch = _metric_batch.get()
+    if batch is not None:
+        ctx = otel_context.get_current() if _METRICS_ACCEPT_CONTEXT else None
+        batch.append((record, value, attributes, ctx))
+    else:
+        record(value, attributes)
+
+
+@contextmanager
+def metric_batch():
+    """Batch measurements emitted inside the block; nested batches join the outer one."""
+    if _metric_batch.get() is not None:
+        yield
+        return
+    batch = []
+    token = _metric_batch.set(batch)
+    try:
+        yield
+    finally:
+        _metric_batch.reset(token)
+        for record, value, attributes, ctx in batch:
+            try:
+                if ctx is not None:
+                    record(value, attributes, context=ctx)
+                else:
+                    record(value, attributes)
+            except Exception as e:
+                logger.warning("Failed to record metric: %s", e)
+
+
+def _batch_metrics_wsgi(wsgi_app):
+    @functools.wraps(wsgi_app)
+    def wrapper(environ, start_response):
+        with metric_batch():
+            return wsgi_app(environ, start_response)
+
+    return wrapper
+
+
+app.wsgi_app = _batch_metrics_wsgi(app.wsgi_app)
+
+
 # ---------------------------------------------------------------------------
 # Database helpers (instrumented with metrics)
 # ---------------------------------------------------------------------------
@@ -156,94 +322,337 @@ db_config = None
 
 
 def get_db_config():
-    """Get database configuration from environment variables."""
+    """Get database configuration from env vars, falling back to the DB secret.
+
+    DB_HOST, DB_PORT, DB_NAME and DB_USER win when set (e.g. to point at an
+    RDS Proxy or a replica); otherwise the host, port, dbname and username
+    fields of an RDS-managed secret are used. Once DB_PASSWORD_TTL has
+    passed the secret is re-read, and a new config dict is only built if
+    the credentials changed.
+    """
     global db_config
-    if db_config is None:
-        db_config = {
-            "host": os.environ["DB_HOST"],
-            "port": int(os.environ["DB_PORT"]),
-            "database": os.environ["DB_NAME"],
-            "user": os.environ["DB_USER"],
-            "password": get_db_password(),
+    if db_config is None or _db_secret_expired():
+        try:
+            secret = get_db_secret()
+        except Exception:
+            if db_config is None:
+                raise
+            # The pool still holds working credentials; keep serving with
+            # them and try the refresh again after another TTL.
+            logger.warning("DB secret refresh failed, keeping cached credentials")
+            _defer_db_secret_refresh()
+            return db_config
+        config = {
+            "host": _db_setting(secret, "DB_HOST", "host"),
+            "port": int(_db_setting(secret, "DB_PORT", "port")),
+            "database": _db_setting(secret, "DB_NAME", "dbname"),
+            "user": _db_setting(secret, "DB_USER", "username"),
+            "password": _db_setting(secret, None, "password"),
         }
+        if config != db_config:
+            db_config = config
     return db_config
 
 
-def get_db_password():
-    """Get database password from AWS Secrets Manager."""
-    try:
-        secrets_client = boto3.client("secretsmanager")
-        secret_response = secrets_client.get_secret_value(
-            SecretId=os.environ["DB_PASSWORD_SECRET"]
+def _db_setting(secret, env_var, field):
+    """Return ``env_var`` if set, else ``field`` of the DB secret."""
+    value = (env_var and os.environ.get(env_var)) or secret.get(field)
+    if value is None:
+        where = f"set {env_var} or add" if env_var else "add"
+        raise RuntimeError(
+            f"Database {field} is not configured: {where} '{field}' to the DB secret"
+        )
+    return value
+
+
+def invalidate_db_config():
+    """Forget the cached secret and config so the next checkout re-reads them."""
+    global db_config, _db_secret_cache
+    db_config = None
+    _db_secret_cache = None
+
+
+# The Secrets Manager client and parsed secret are cached at module scope so warm
+# invocations never pay for a Secrets Manager round trip. boto3 (and its
+# botocore data files) is only imported if the Parameters and Secrets
+# Lambda Extension is not in use, keeping it off the cold-start path.
+_SECRETS_CLIENT = None
+DB_PASSWORD_TTL = int(os.environ.get("DB_PASSWORD_TTL", "900"))
+USE_SECRETS_EXTENSION = os.environ.get("USE_SECRETS_EXTENSION", "false").lower() == "true"
+SECRETS_EXTENSION_PORT = os.environ.get("PARAMETERS_SECRETS_EXTENSION_HTTP_PORT", "2773")
+_db_secret_cache = None  # (parsed secret, fetched_at)
+# Seconds to connect and to read per Secrets Manager attempt. botocore's
+# defaults (60 s each, with retries) could outlast the 10 s INIT limit.
+SECRETS_TIMEOUT = float(os.environ.get("SECRETS_TIMEOUT", "1"))
+SECRETS_MAX_ATTEMPTS = int(os.environ.get("SECRETS_MAX_ATTEMPTS", "2"))
+
+
+def get_secret_string(secret_id):
+    """Fetch a secret's SecretString, via the Lambda extension when enabled."""
+    global _SECRETS_CLIENT
+    if USE_SECRETS_EXTENSION:
+        req = urllib.request.Request(
+            f"http://localhost:{SECRETS_EXTENSION_PORT}/secretsmanager/get"
+            f"?secretId={urllib.parse.quote(secret_id, safe='')}",
+            headers={
+                "X-Aws-Parameters-Secrets-Token": os.environ["AWS_SESSION_TOKEN"]
+            },
         )
-        secret_data = json.loads(secret_response["SecretString"])
-        return secret_data["password"]
+        with urllib.request.urlopen(req, timeout=SECRETS_TIMEOUT) as resp:
+            return orjson.loads(resp.read())["SecretString"]
+
+    if _SECRETS_CLIENT is None:
+        import boto3
+        from botocore.config import Config
+
+        _SECRETS_CLIENT = boto3.client(
+            "secretsmanager",
+            config=Config(
+                connect_timeout=SECRETS_TIMEOUT,
+                read_timeout=SECRETS_TIMEOUT,
+                retries={"mode": "standard", "total_max_attempts": SECRETS_MAX_ATTEMPTS},
+            ),
+        )
+    return _SECRETS_CLIENT.get_secret_value(SecretId=secret_id)["SecretString"]
+
+
+def _db_secret_expired():
+    return (
+        _db_secret_cache is None
+        or time.monotonic() - _db_secret_cache[1] >= DB_PASSWORD_TTL
+    )
+
+
+def _defer_db_secret_refresh():
+    """Restart the TTL on the cached secret without re-reading it."""
+    global _db_secret_cache
+    if _db_secret_cache is not None:
+        _db_secret_cache = (_db_secret_cache[0], time.monotonic())
+
+
+def get_db_secret():
+    """Get the parsed DB secret from AWS Secrets Manager, cached for DB_PASSWORD_TTL seconds."""
+    global _db_secret_cache
+    if not _db_secret_expired():
+        return _db_secret_cache[0]
+    try:
+        secret_data = orjson.loads(get_secret_string(os.environ["DB_PASSWORD_SECRET"]))
+        _db_secret_cache = (secret_data, time.monotonic())
+        return secret_data
     except Exception as e:
-        logger.error(f"Error getting database password: {e}", exc_info=True)
+        logger.error("Error getting database secret: %s", e, exc_info=True)
         raise
 
 
+# The fixed book queries are prepared once per pooled connection, so
+# Postgres parses and plans them once per session rather than per request.
+_BOOK_COLUMNS = "id, title, author, isbn, description, price, created_at, updated_at"
+
+BOOKS_PAGE_DEFAULT = int(os.environ.get("BOOKS_PAGE_DEFAULT", "100"))
+BOOKS_PAGE_MAX = int(os.environ.get("BOOKS_PAGE_MAX", "1000"))
+
+
+def _isoformat_sql(column):
+    """SQL rendering a timestamp column the way datetime.isoformat() does.
+
+    Postgres' own JSON text trims trailing fractional digits; isoformat()
+    (and orjson) print six digits, or none when the microseconds are zero.
+    """
+    return (
+        f"""(to_char({column}, 'YYYY-MM-DD"T"HH24:MI:SS') ||"""
+        f""" CASE WHEN extract(microseconds FROM {column})::bigint % 1000000 = 0"""
+        f""" THEN '' ELSE to_char({column}, '.US') END)"""
+    )
+
+
+# Columns for the Postgres-rendered list, encoded exactly as _dumps() encodes
+# a single book row: numeric price as its string form, timestamps as isoformat.
+_BOOK_JSON_COLUMNS = (
+    "id, title, author, isbn, description, price::text AS price, "
+    f"{_isoformat_sql('created_at')} AS created_at, "
+    f"{_isoformat_sql('updated_at')} AS updated_at"
+)
+
+PREPARED_STATEMENTS = {
+    # The list is rendered to JSON by Postgres, so the route hands the
+    # payload straight to the client without building per-row dicts.
+    # Keyset pagination: $1 is the last id already seen, $2 the page size.
+    "books_select_page": f"""SELECT count(*) AS book_count, max(b.id) AS last_id,
+               COALESCE(json_agg(row_to_json(b) ORDER BY b.id), '[]'::json)::text AS payload
+        FROM (SELECT {_BOOK_JSON_COLUMNS} FROM books
+              WHERE id > $1 ORDER BY id LIMIT $2) b""",
+    "books_select_one": f"SELECT {_BOOK_COLUMNS} FROM books WHERE id = $1",
+    "books_insert": f"""INSERT INTO books (title, author, isbn, description, price)
+        VALUES ($1, $2, $3, $4, $5)
+        RETURNING {_BOOK_COLUMNS}""",
+    # $1-$5 are the new values and $6-$10 flag which of them were supplied,
+    # so one plan serves every partial update and an explicit null still
+    # sets the column to NULL.
+    "books_update": f"""UPDATE books
+        SET title = CASE WHEN $6 THEN $1 ELSE title END,
+            author = CASE WHEN $7 THEN $2 ELSE author END,
+            isbn = CASE WHEN $8 THEN $3 ELSE isbn END,
+            description = CASE WHEN $9 THEN $4 ELSE description END,
+            price = CASE WHEN $10 THEN $5 ELSE price END,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE id = $11
+        RETURNING {_BOOK_COLUMNS}""",
+    "books_delete": "DELETE FROM books WHERE id = $1 RETURNING id",
+}
+
+# Declared parameter types. Ids are bigint so an id past the int column's
+# range matches no row instead of failing with "integer out of range";
+# "unknown" leaves the type to be inferred from the column as before.
+PREPARED_PARAM_TYPES = {
+    "books_select_page": "bigint, bigint",
+    "books_select_one": "bigint",
+    "books_insert": "unknown, unknown, unknown, unknown, unknown",
+    "books_update": ", ".join(["unknown"] * 5 + ["boolean"] * 5 + ["bigint"]),
+    "books_delete": "bigint",
+}
+# Largest id the statements accept; anything above it cannot exist.
+PG_BIGINT_MAX = 2**63 - 1
+
+
+class PreparedConnection(psycopg2.extensions.connection):
+    """psycopg2 connection that remembers whether PREPARED_STATEMENTS ran."""
+
+    statements_prepared = False
+    pool = None  # the pool this connection was checked out from
+
+    def prepare_statements(self):
+        """PREPARE every statement in PREPARED_STATEMENTS in one round trip."""
+        with self.cursor() as cursor:
+            cursor.execute(
+                "; ".join(
+                    f"PREPARE {name}({PREPARED_PARAM_TYPES[name]}) AS {query}"
+                    for name, query in PREPARED_STATEMENTS.items()
+                )
+            )
+        self.commit()
+        self.statements_prepared = True
+
+
+_POOL = None
+_pool_config = None  # the db_config dict _POOL was built from
+DB_POOL_MAX = int(os.environ.get("DB_POOL_MAX", "10"))
+# Seconds libpq waits for a connection before giving up.
+DB_CONNECT_TIMEOUT = int(os.environ.get("DB_CONNECT_TIMEOUT", "5"))
+
+
+def get_db_pool():
+    """Get the module-level connection pool, creating it on first use.
+
+    Lambda reuses the execution environment between invocations, so the
+    pool (and its open connections) stays warm across warm starts. The pool
+    is rebuilt when get_db_config() returns new (rotated) credentials.
+    """
+    global _POOL, _pool_config
+    config = get_db_config()
+    if _POOL is None or config is not _pool_config:
+        if _POOL is not None:
+            logger.info("Database credentials changed, rebuilding connection pool")
+        # Build the replacement first: if connecting fails, the old pool is
+        # left open and the rebuild is simply retried on the next checkout.
+        new_pool = psycopg2.pool.ThreadedConnectionPool(
+            minconn=1,
+            maxconn=DB_POOL_MAX,
+            connection_factory=PreparedConnection,
+            connect_timeout=DB_CONNECT_TIMEOUT,
+            **config,
+        )
+        old_pool, _POOL, _pool_config = _POOL, new_pool, config
+        if old_pool is not None:
+            old_pool.closeall()
+    return _POOL
+
+
 def get_db_connection():
-    """Get database connection, recording connection time as a metric."""
-    start = time.monotonic()
+    """Check a connection out of the pool, recording checkout time as a metric."""
+    start = time.monotonic_ns()
     try:
-        config = get_db_config()
-        conn = psycopg2.connect(
-            host=config["host"],
-            port=config["port"],
-            database=config["database"],
-            user=config["user"],
-            password=config["password"],
-            cursor_factory=RealDictCursor,
-        )
-        duration_ms = (time.monotonic() - start) * 1000
+        pool = get_db_pool()
+        conn = pool.getconn()
+        conn.pool = pool
+        if not conn.statements_prepared:
+            try:
+                conn.prepare_statements()
+            except Exception:
+                pool.putconn(conn, close=True)
+                raise
+        duration_ms = (time.monotonic_ns() - start) / 1_000_000
         if db_connection_duration:
-            db_connection_duration.record(
-                duration_ms, _labels(**{"db.system": "postgresql"})
+            _emit(
+                db_connection_duration.record,
+                duration_ms,
+                _labels((("db.system", "postgresql"),)),
             )
         return conn
     except Exception as e:
-        duration_ms = (time.monotonic() - start) * 1000
+        duration_ms = (time.monotonic_ns() - start) / 1_000_000
         if db_connection_duration:
-            db_connection_duration.record(
-                duration_ms, _labels(**{"db.system": "postgresql", "error": True})
-            )
-        if app_error_counter:
-            app_error_counter.add(
-                1,
-                _labels(
-                    **{
-                        "error.type": "database_connection",
-                        "http.route": getattr(request, "path", "unknown"),
-                    }
-                ),
+            _emit(
+                db_connection_duration.record,
+                duration_ms,
+                _labels((("db.system", "postgresql"), ("error", True))),
             )
-        logger.error(f"Error connecting to database: {e}", exc_info=True)
+        _record_error("database_connection")
+        if isinstance(e, psycopg2.OperationalError) and "authentication failed" in str(e):
+            # Most likely a rotated password: re-read the secret next time
+            invalidate_db_config()
+        logger.error("Error connecting to database: %s", e, exc_info=True)
         raise
 
 
+@contextmanager
+def db_conn():
+    """Yield a pooled connection and return it to the pool afterwards.
+
+    Any open transaction is rolled back if the block raises; connections
+    that were closed underneath us are discarded rather than reused.
+    """
+    conn = get_db_connection()
+    try:
+        yield conn
+    except Exception:
+        if not conn.closed:
+            try:
+                conn.rollback()
+            except psycopg2.Error as e:
+                logger.warning("Rollback failed on pooled connection: %s", e)
+        raise
+    finally:
+        if conn.pool.closed:
+            # The pool was rebuilt while this connection was checked out
+            conn.close()
+        else:
+            conn.pool.putconn(conn, close=bool(conn.closed))
+
+
 def execute_query(cursor, query, params=None, operation="select"):
     """Execute a query and record its duration as a metric."""
-    start = time.monotonic()
+    start = time.monotonic_ns()
     try:
         cursor.execute(query, params)
-        duration_ms = (time.monotonic() - start) * 1000
+        duration_ms = (time.monotonic_ns() - start) / 1_000_000
         if db_query_duration:
-            db_query_duration.record(
+            _emit(
+                db_query_duration.record,
                 duration_ms,
-                _labels(**{"db.system": "postgresql", "db.operation": operation}),
+                _labels((("db.system", "postgresql"), ("db.operation", operation))),
             )
     except Exception:
-        duration_ms = (time.monotonic() - start) * 1000
+        duration_ms = (time.monotonic_ns() - start) / 1_000_000
         if db_query_duration:
-            db_query_duration.record(
+            _emit(
+                db_query_duration.record,
                 duration_ms,
                 _labels(
-                    **{
-                        "db.system": "postgresql",
-                        "db.operation": operation,
-                        "error": True,
-                    }
+                    (
+                        ("db.system", "postgresql"),
+                        ("db.operation", operation),
+                        ("error", True),
+                    )
                 ),
             )
         raise
@@ -256,85 +665,93 @@ LATENCY_PROBABILITY = float(os.environ.get("LATENCY_PROBABILITY", "0.05"))
 LATENCY_MAX_MS = int(os.environ.get("LATENCY_MAX_MS", "1300"))
 
 
+# Compared against random.getrandbits(32) so the gate is a single int compare
+_LATENCY_THRESHOLD = int(min(max(LATENCY_PROBABILITY, 0.0), 1.0) * 2**32)
+_LATENCY_LABELS = _labels()
+
+
+def inject_latency():
+    """Sleep for a random delay with probability LATENCY_PROBABILITY."""
+    if random.getrandbits(32) < _LATENCY_THRESHOLD:
+        delay_ms = random.randint(100, LATENCY_MAX_MS)
+        logger.info("[Latency Injector] Delaying request by %s ms", delay_ms)
+        if latency_injection_counter:
+            _emit(latency_injection_counter.add, 1, _LATENCY_LABELS)
+        if latency_injection_duration:
+            _emit(latency_injection_duration.record, delay_ms, _LATENCY_LABELS)
+        time.sleep(delay_ms / 1000.0)
+
+
 def maybe_delay(func):
+    """Wrap a view with latency injection; a no-op when injection is disabled."""
+    if _LATENCY_THRESHOLD <= 0:
+        return func
+
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        if random.random() < LATENCY_PROBABILITY:
-            delay_ms = random.randint(100, LATENCY_MAX_MS)
-            logger.info(f"[Latency Injector] Delaying request by {delay_ms} ms")
-            if latency_injection_counter:
-                latency_injection_counter.add(
-                    1,
-                    _labels(
-                        **{
-                            "http.route": request.path,
-                            "http.method": request.method,
-                        }
-                    ),
-                )
-            if latency_injection_duration:
-                latency_injection_duration.record(
-                    delay_ms,
-                    _labels(
-                        **{
-                            "http.route": request.path,
-                            "http.method": request.method,
-                        }
-                    ),
-                )
-            time.sleep(delay_ms / 1000.0)
+        inject_latency()
         return func(*args, **kwargs)
 
     return wrapper
 
 
 # ---------------------------------------------------------------------------
-# Helper: serialise a book row to JSON-safe dict
+# Helper: JSON responses via orjson
 # ---------------------------------------------------------------------------
-def _serialise_book(book):
-    d = dict(book)
-    if d.get("created_at"):
-        d["created_at"] = d["created_at"].isoformat()
-    if d.get("updated_at"):
-        d["updated_at"] = d["updated_at"].isoformat()
-    return d
+def _dumps(payload):
+    """Encode a payload to JSON bytes with orjson.
+
+    orjson serialises dict subclasses (RealDictRow) and datetimes natively;
+    anything else it doesn't know (e.g. Decimal prices) falls back to str().
+    """
+    return orjson.dumps(payload, default=str)
+
+
+def ojsonify(payload, status=200):
+    """Build a JSON response with orjson."""
+    return Response(_dumps(payload), status=status, mimetype="application/json")
+
+
+def _json_bytes_response(body, status=200, headers=None):
+    """Wrap already-encoded JSON (bytes or str) in a response."""
+    return Response(body, status=status, headers=headers, mimetype="application/json")
+
+
+# Fixed response bodies, encoded once at import time
+TEST_BYTES = orjson.dumps({
+    "status": "ok",
+    "message": "Test endpoint working",
+    "service": WORKLOAD,
+    "version": "2.0.0",
+})
+HEALTHY_BYTES = orjson.dumps({
+    "status": "healthy",
+    "service": WORKLOAD,
+    "version": "2.0.0",
+    "database": "connected",
+})
+BOOK_NOT_FOUND_BYTES = orjson.dumps({"error": "Book not found"})
+NO_FIELDS_BYTES = orjson.dumps({"error": "No fields to update"})
+NOT_FOUND_BYTES = orjson.dumps({"error": "Not found"})
+INTERNAL_ERR_BYTES = orjson.dumps({"error": "Internal server error"})
 
 
 # ---------------------------------------------------------------------------
 # Error recording helper
 # ---------------------------------------------------------------------------
-def _record_error(error_type, http_route, http_status_code, http_method="GET"):
+def _record_error(error_type):
     """Record an application error with consistent labels."""
     if app_error_counter:
-        app_error_counter.add(
-            1,
-            _labels(
-                **{
-                    "error.type": error_type,
-                    "http.route": http_route,
-                    "http.status_code": str(http_status_code),
-                    "http.method": http_method,
-                }
-            ),
-        )
+        _emit(app_error_counter.add, 1, _labels((("error.type", error_type),)))
 
 
 # ---------------------------------------------------------------------------
 # Operation recording helper
 # ---------------------------------------------------------------------------
-def _record_operation(operation, http_route, http_method="GET"):
+def _record_operation(operation):
     """Record a book CRUD operation with consistent labels."""
     if book_operations_counter:
-        book_operations_counter.add(
-            1,
-            _labels(
-                **{
-                    "operation": operation,
-                    "http.route": http_route,
-                    "http.method": http_method,
-                }
-            ),
-        )
+        _emit(book_operations_counter.add, 1, _labels((("operation", operation),)))
 
 
 # ---------------------------------------------------------------------------
@@ -344,26 +761,23 @@ def _record_operation(operation, http_route, http_method="GET"):
 @maybe_delay
 def health_check():
     """Health check endpoint."""
+    return _json_bytes_response(*check_health())
+
+
+def check_health():
+    """Ping the database; return the encoded health body and status code."""
     logger.info("Health check started")
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        execute_query(cursor, "SELECT 1", operation="health_check")
-        cursor.fetchone()
-        cursor.close()
-        conn.close()
+        with db_conn() as conn, conn.cursor() as cursor:
+            execute_query(cursor, "SELECT 1", operation="health_check")
+            cursor.fetchone()
         logger.info("Health check completed successfully")
 
-        return jsonify({
-            "status": "healthy",
-            "service": WORKLOAD,
-            "version": "2.0.0",
-            "database": "connected",
-        })
+        return HEALTHY_BYTES, 200
     except Exception as e:
-        logger.error(f"Health check failed: {e}")
-        _record_error("health_check", "/healthz", 500)
-        return jsonify({
+        logger.error("Health check failed: %s", e)
+        _record_error("health_check")
+        return orjson.dumps({
             "status": "unhealthy",
             "service": WORKLOAD,
             "version": "2.0.0",
@@ -376,76 +790,83 @@ def health_check():
 @maybe_delay
 def test_endpoint():
     """Simple test endpoint without database access."""
-    return jsonify({
-        "status": "ok",
-        "message": "Test endpoint working",
-        "service": WORKLOAD,
-        "version": "2.0.0",
-    })
+    return _json_bytes_response(TEST_BYTES)
 
 
 @app.route("/books", methods=["GET"])
 @maybe_delay
 def get_books():
-    """Get all books."""
-    logger.info("GET /books - Retrieving all books")
+    """Get a page of books ordered by id.
+
+    Query args: ``limit`` (default BOOKS_PAGE_DEFAULT, capped at
+    BOOKS_PAGE_MAX) and ``after``, the last id of the previous page. A full
+    page carries an ``X-Next-After`` header to pass as ``after`` next.
+    """
+    # Unparseable values fall back to the defaults (werkzeug's type=int).
+    limit = request.args.get("limit", BOOKS_PAGE_DEFAULT, type=int)
+    after_id = request.args.get("after", 0, type=int)
+    return _json_bytes_response(*list_books(limit, after_id))
+
+
+def list_books(limit, after_id):
+    """Return the encoded page after ``after_id``, a status code and headers."""
+    logger.info("GET /books - Retrieving books")
+    limit = min(max(limit, 1), BOOKS_PAGE_MAX)
+    after_id = min(max(after_id, 0), PG_BIGINT_MAX)
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        execute_query(
-            cursor,
-            """SELECT id, title, author, isbn, description, price, created_at, updated_at
-               FROM books ORDER BY id""",
-            operation="select",
-        )
-        books = cursor.fetchall()
-        cursor.close()
-        conn.close()
-
-        result = [_serialise_book(b) for b in books]
+        with db_conn() as conn, conn.cursor() as cursor:
+            execute_query(
+                cursor,
+                "EXECUTE books_select_page(%s, %s)",
+                (after_id, limit),
+                operation="select",
+            )
+            book_count, last_id, payload = cursor.fetchone()
 
         if books_result_count:
-            books_result_count.record(
-                len(result),
-                _labels(**{"http.route": "/books", "http.method": "GET"}),
-            )
-        _record_operation("list", "/books", "GET")
+            _emit(books_result_count.record, book_count, _labels())
+        _record_operation("list")
 
-        return jsonify(result)
+        # Only a full page can have more rows behind it.
+        headers = {"X-Next-After": str(last_id)} if book_count == limit else {}
+        return payload, 200, headers
     except Exception as e:
-        logger.error(f"Error getting books: {e}")
-        _record_error("database_query", "/books", 500)
-        return jsonify({"error": "Failed to get books", "message": str(e)}), 500
+        logger.error("Error getting books: %s", e)
+        _record_error("database_query")
+        return _dumps({"error": "Failed to get books", "message": str(e)}), 500
 
 
 @app.route("/books/<int:book_id>", methods=["GET"])
 @maybe_delay
 def get_book(book_id):
     """Get a specific book by ID."""
-    logger.info(f"GET /books/{book_id} - Retrieving book")
+    return _json_bytes_response(*fetch_book(book_id))
+
+
+def fetch_book(book_id):
+    """Return the encoded book (or a 404 body) and a status code."""
+    logger.info("GET /books/%s - Retrieving book", book_id)
+    if book_id > PG_BIGINT_MAX:
+        return BOOK_NOT_FOUND_BYTES, 404
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        execute_query(
-            cursor,
-            """SELECT id, title, author, isbn, description, price, created_at, updated_at
-               FROM books WHERE id = %s""",
-            (book_id,),
-            operation="select",
-        )
-        book = cursor.fetchone()
-        cursor.close()
-        conn.close()
+        with db_conn() as conn, conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            execute_query(
+                cursor,
+                "EXECUTE books_select_one(%s)",
+                (book_id,),
+                operation="select",
+            )
+            book = cursor.fetchone()
 
-        _record_operation("get", "/books/<id>", "GET")
+        _record_operation("get")
 
         if book:
-            return jsonify(_serialise_book(book))
-        return jsonify({"error": "Book not found"}), 404
+            return _dumps(book), 200
+        return BOOK_NOT_FOUND_BYTES, 404
     except Exception as e:
-        logger.error(f"Error getting book {book_id}: {e}")
-        _record_error("database_query", "/books/<id>", 500, "GET")
-        return jsonify({"error": "Failed to get book", "message": str(e)}), 500
+        logger.error("Error getting book %s: %s", book_id, e)
+        _record_error("database_query")
+        return _dumps({"error": "Failed to get book", "message": str(e)}), 500
 
 
 @app.route("/books", methods=["POST"])
@@ -458,129 +879,129 @@ def create_book():
         required_fields = ["title", "author", "isbn", "description", "price"]
         for field in required_fields:
             if field not in data:
-                _record_error("validation", "/books", 400, "POST")
-                return jsonify({"error": "Missing required field", "field": field}), 400
-
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        execute_query(
-            cursor,
-            """INSERT INTO books (title, author, isbn, description, price)
-               VALUES (%s, %s, %s, %s, %s)
-               RETURNING id, title, author, isbn, description, price, created_at, updated_at""",
-            (
-                data["title"],
-                data["author"],
-                data["isbn"],
-                data["description"],
-                float(data["price"]),
-            ),
-            operation="insert",
-        )
-        book = cursor.fetchone()
-        conn.commit()
-        cursor.close()
-        conn.close()
+                _record_error("validation")
+                return ojsonify({"error": "Missing required field", "field": field}, 400)
+
+        with db_conn() as conn, conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            execute_query(
+                cursor,
+                "EXECUTE books_insert(%s, %s, %s, %s, %s)",
+                (
+                    data["title"],
+                    data["author"],
+                    data["isbn"],
+                    data["description"],
+                    float(data["price"]),
+                ),
+                operation="insert",
+            )
+            book = cursor.fetchone()
+            conn.commit()
 
-        _record_operation("create", "/books", "POST")
+        _record_operation("create")
 
-        return jsonify(_serialise_book(book)), 201
+        return ojsonify(book, 201)
 
     except psycopg2.IntegrityError as e:
-        logger.warning(f"Database integrity error: {e}")
-        _record_error("integrity_violation", "/books", 409, "POST")
-        return jsonify({
+        logger.warning("Database integrity error: %s", e)
+        _record_error("integrity_violation")
+        return ojsonify({
             "error": "Book with this ISBN already exists",
             "message": str(e),
-        }), 409
+        }, 409)
     except Exception as e:
-        logger.error(f"Error creating book: {e}")
-        _record_error("database_query", "/books", 500, "POST")
-        return jsonify({"error": "Failed to create book", "message": str(e)}), 500
+        logger.error("Error creating book: %s", e)
+        _record_error("database_query")
+        return ojsonify({"error": "Failed to create book", "message": str(e)}, 500)
 
 
 @app.route("/books/<int:book_id>", methods=["PUT"])
 def update_book(book_id):
     """Update a book."""
-    logger.info(f"PUT /books/{book_id} - Updating book")
+    logger.info("PUT /books/%s - Updating book", book_id)
+    if book_id > PG_BIGINT_MAX:
+        return _json_bytes_response(BOOK_NOT_FOUND_BYTES, 404)
     try:
         data = request.get_json()
 
-        update_fields = []
+        # One value and one "supplied" flag per column
         values = []
+        supplied = []
         for field in ["title", "author", "isbn", "description", "price"]:
             if field in data:
-                update_fields.append(f"{field} = %s")
                 values.append(float(data[field]) if field == "price" else data[field])
+                supplied.append(True)
+            else:
+                values.append(None)
+                supplied.append(False)
+
+        if not any(supplied):
+            _record_error("validation")
+            return _json_bytes_response(NO_FIELDS_BYTES, 400)
+
+        params = values + supplied + [book_id]
+
+        with db_conn() as conn, conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            execute_query(
+                cursor,
+                "EXECUTE books_update(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
+                params,
+                operation="update",
+            )
+            book = cursor.fetchone()
+            conn.commit()
 
-        if not update_fields:
-            _record_error("validation", "/books/<id>", 400, "PUT")
-            return jsonify({"error": "No fields to update"}), 400
-
-        values.append(book_id)
-
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        execute_query(
-            cursor,
-            f"""UPDATE books
-                SET {', '.join(update_fields)}, updated_at = CURRENT_TIMESTAMP
-                WHERE id = %s
-                RETURNING id, title, author, isbn, description, price, created_at, updated_at""",
-            values,
-            operation="update",
-        )
-        book = cursor.fetchone()
-        conn.commit()
-        cursor.close()
-        conn.close()
-
-        _record_operation("update", "/books/<id>", "PUT")
+        _record_operation("update")
 
         if book:
-            return jsonify(_serialise_book(book))
-        return jsonify({"error": "Book not found"}), 404
+            return ojsonify(book)
+        return _json_bytes_response(BOOK_NOT_FOUND_BYTES, 404)
 
     except psycopg2.IntegrityError as e:
-        logger.warning(f"Database integrity error: {e}")
-        _record_error("integrity_violation", "/books/<id>", 409, "PUT")
-        return jsonify({
+        logger.warning("Database integrity error: %s", e)
+        _record_error("integrity_violation")
+        return ojsonify({
             "error": "Book with this ISBN already exists",
             "message": str(e),
-        }), 409
+        }, 409)
     except Exception as e:
-        logger.error(f"Error updating book {book_id}: {e}")
-        _record_error("database_query", "/books/<id>", 500, "PUT")
-        return jsonify({"error": "Failed to update book", "message": str(e)}), 500
+        logger.error("Error updating book %s: %s", book_id, e)
+        _record_error("database_query")
+        return ojsonify({"error": "Failed to update book", "message": str(e)}, 500)
 
 
 @app.route("/books/<int:book_id>", methods=["DELETE"])
 def delete_book(book_id):
     """Delete a book."""
-    logger.info(f"DELETE /books/{book_id} - Deleting book")
+    return _json_bytes_response(*remove_book(book_id))
+
+
+def remove_book(book_id):
+    """Delete a book; return the encoded result and a status code."""
+    logger.info("DELETE /books/%s - Deleting book", book_id)
+    if book_id > PG_BIGINT_MAX:
+        return BOOK_NOT_FOUND_BYTES, 404
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        execute_query(
-            cursor,
-            "DELETE FROM books WHERE id = %s RETURNING id",
-            (book_id,),
-            operation="delete",
-        )
-        deleted_book = cursor.fetchone()
-        conn.commit()
-        cursor.close()
-        conn.close()
+        with db_conn() as conn, conn.cursor() as cursor:
+            execute_query(
+                cursor,
+                "EXECUTE books_delete(%s)",
+                (book_id,),
+                operation="delete",
+            )
+            deleted_book = cursor.fetchone()
+            deleted_id = deleted_book[0] if deleted_book else None
+            conn.commit()
 
-        _record_operation("delete", "/books/<id>", "DELETE")
+        _record_operation("delete")
 
-        if deleted_book:
-            return jsonify({"message": "Book deleted successfully", "id": book_id})
-        return jsonify({"error": "Book not found"}), 404
+        if deleted_id is not None:
+            return _dumps({"message": "Book deleted successfully", "id": deleted_id}), 200
+        return BOOK_NOT_FOUND_BYTES, 404
     except Exception as e:
-        logger.error(f"Error deleting book {book_id}: {e}")
-        _record_error("database_query", "/books/<id>", 500, "DELETE")
-        return jsonify({"error": "Failed to delete book", "message": str(e)}), 500
+        logger.error("Error deleting book %s: %s", book_id, e)
+        _record_error("database_query")
+        return _dumps({"error": "Failed to delete book", "message": str(e)}), 500
 
 
 # ---------------------------------------------------------------------------
@@ -588,23 +1009,227 @@ def delete_book(book_id):
 # ---------------------------------------------------------------------------
 @app.errorhandler(404)
 def not_found(error):
-    return jsonify({"error": "Not found"}), 404
+    return _json_bytes_response(NOT_FOUND_BYTES, 404)
 
 
 @app.errorhandler(500)
 def internal_error(error):
-    return jsonify({"error": "Internal server error"}), 500
+    return _json_bytes_response(INTERNAL_ERR_BYTES, 500)
+
+
+# ---------------------------------------------------------------------------
+# Init-time warm-up
+#
+# One-time work (Secrets Manager lookup, pool creation, the Postgres TLS
+# handshake and statement preparation) runs while the module is imported, so
+# it is billed to Lambda INIT rather than to the first request. On SnapStart
+# the pool is closed before the snapshot is taken and reopened after restore,
+# because sockets captured in a snapshot are dead once it is resumed.
+# ---------------------------------------------------------------------------
+try:
+    from snapshot_restore_py import register_after_restore, register_before_snapshot
+except ImportError:
+    register_after_restore = register_before_snapshot = None
+
+
+# Seconds _init may spend before the 10 s Lambda INIT limit gets close.
+INIT_TIMEOUT = float(os.environ.get("INIT_TIMEOUT", "8"))
+
+
+def _init():
+    """Open the pool and prime one connection with a round trip to Postgres.
+
+    The warm-up is skipped, and left to the first request, when fetching the
+    secret has used too much of INIT_TIMEOUT for a full DB_CONNECT_TIMEOUT.
+    """
+    start = time.monotonic()
+    try:
+        get_db_config()
+        if time.monotonic() - start + DB_CONNECT_TIMEOUT > INIT_TIMEOUT:
+            logger.warning("Skipping init-time database warm-up, init time budget used up")
+            return
+        with db_conn() as conn, conn.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+        logger.info("Database pool warmed up during init")
+    except Exception as e:
+        logger.warning("Init-time database warm-up failed, retrying on first request: %s", e)
+
+
+def _close_pool():
+    """Close every pooled connection so none are captured in a snapshot."""
+    global _POOL
+    if _POOL is not None:
+        _POOL.closeall()
+        _POOL = None
+
+
+if "AWS_LAMBDA_FUNCTION_NAME" in os.environ:
+    _init()
+    if register_before_snapshot:
+        register_before_snapshot(_close_pool)
+        register_after_restore(_init)
 
 
 # ---------------------------------------------------------------------------
 # Lambda entry point
 # ---------------------------------------------------------------------------
+OTEL_FLUSH_REMAINING_MS = int(os.environ.get("OTEL_FLUSH_REMAINING_MS", "500"))
+# Time kept back from the final flush so the handler still returns in time.
+OTEL_FLUSH_HEADROOM_MS = 100
+
+
+def _shutdown_telemetry(signum, frame):
+    """Export queued OTLP logs before Lambda reclaims the environment.
+
+    Lambda freezes the sandbox between invocations, so the batch processor's
+    thread cannot be relied on to drain the queue. Because the collector
+    extension is registered, Lambda sends SIGTERM before shutdown. Normal
+    interpreter exit is already covered by the SDK's own atexit hook.
+    """
+    if logger_provider:
+        logger_provider.shutdown()
+    sys.exit(0)
+
+
+if logger_provider:
+    signal.signal(signal.SIGTERM, _shutdown_telemetry)
+
+
+def _lambda_response(event, body, status=200, headers=None):
+    """Build an API Gateway / ALB proxy response from encoded JSON (bytes or str).
+
+    Events that carry ``multiValueHeaders`` (REST APIs, ALB with multi-value
+    headers enabled) are answered with ``multiValueHeaders``; ALB also
+    expects a ``statusDescription``.
+    """
+    response = {
+        "statusCode": status,
+        "body": body if isinstance(body, str) else body.decode(),
+        "isBase64Encoded": False,
+    }
+    headers = {"Content-Type": "application/json", **(headers or {})}
+    if "multiValueHeaders" in event:
+        response["multiValueHeaders"] = {k: [v] for k, v in headers.items()}
+    else:
+        response["headers"] = headers
+    if "elb" in (event.get("requestContext") or {}):
+        response["statusDescription"] = f"{status} {HTTPStatus(status).phrase}"
+    return response
+
+
+def _event_route(event):
+    """Return (path, method) for API Gateway REST/HTTP API and ALB events."""
+    if "rawPath" in event:
+        return event["rawPath"], event["requestContext"]["http"]["method"]
+    return event.get("path"), event.get("httpMethod")
+
+
+def _int_param(event, name, default):
+    """Read an integer query parameter, falling back to ``default`` like werkzeug."""
+    value = (event.get("queryStringParameters") or {}).get(name)
+    if value is None:
+        values = (event.get("multiValueQueryStringParameters") or {}).get(name)
+        value = values[0] if values else None
+    try:
+        return int(value) if value is not None else default
+    except ValueError:
+        return default
+
+
+@maybe_delay
+def _fast_test(event):
+    return _lambda_response(event, TEST_BYTES)
+
+
+@maybe_delay
+def _fast_health_check(event):
+    return _lambda_response(event, *check_health())
+
+
+@maybe_delay
+def _fast_get_books(event):
+    limit = _int_param(event, "limit", BOOKS_PAGE_DEFAULT)
+    after_id = _int_param(event, "after", 0)
+    return _lambda_response(event, *list_books(limit, after_id))
+
+
+@maybe_delay
+def _fast_get_book(event, book_id):
+    return _lambda_response(event, *fetch_book(book_id))
+
+
+def _fast_delete_book(event, book_id):
+    return _lambda_response(event, *remove_book(book_id))
+
+
+# Routes dispatched straight from lambda_handler, without building a WSGI
+# environ or matching Werkzeug's URL map. Requests with a JSON body
+# (POST/PUT) still go through Flask for request parsing.
+_STATIC_ROUTES = {
+    ("/test", "GET"): _fast_test,
+    ("/healthz", "GET"): _fast_health_check,
+    ("/books", "GET"): _fast_get_books,
+}
+_BOOK_ID_ROUTE = "/books/<int:book_id>"
+_BOOK_ID_RE = re.compile(r"^/books/(\d+)$")
+_BOOK_ID_ROUTES = {
+    "GET": _fast_get_book,
+    "DELETE": _fast_delete_book,
+}
+
+
+def _fast_dispatch(event):
+    """Serve the request directly if it matches a known route, else None."""
+    path, method = _event_route(event)
+    handler = _STATIC_ROUTES.get((path, method))
+    if handler is not None:
+        return _run_fast_route(path, method, handler, event)
+    handler = _BOOK_ID_ROUTES.get(method)
+    if handler is not None and path:
+        match = _BOOK_ID_RE.match(path)
+        if match:
+            return _run_fast_route(
+                _BOOK_ID_ROUTE, method, handler, event, int(match.group(1))
+            )
+    return None
+
+
+def _run_fast_route(route, method, handler, *args):
+    """Run a fast-path handler with the route-level span and timing Flask would get."""
+    start = time.monotonic_ns()
+    attributes = _labels((("http.route", route), ("http.method", method)))
+    span_cm = (
+        tracer.start_as_current_span(
+            f"{method} {route}", kind=trace.SpanKind.SERVER, attributes=attributes
+        )
+        if tracer
+        else nullcontext()
+    )
+    with span_cm as span:
+        response = handler(*args)
+        if span is not None:
+            span.set_attribute("http.status_code", response["statusCode"])
+        # Emitted inside the span so the duration is linked to it.
+        if fast_path_duration:
+            _emit(
+                fast_path_duration.record,
+                (time.monotonic_ns() - start) / 1_000_000,
+                attributes,
+            )
+    return response
+
+
 def lambda_handler(event, context):
     """AWS Lambda handler for Flask app."""
     try:
-        return aws_lambda_wsgi.response(app, event, context)
+        with metric_batch():
+            response = _fast_dispatch(event)
+            if response is None:
+                response = aws_lambda_wsgi.response(app, event, context)
+        return response
     except Exception as e:
-        logger.error(f"Lambda handler error: {e}")
+        logger.error("Lambda handler error: %s", e)
         return {
             "statusCode": 500,
             "body": json.dumps({
@@ -613,9 +1238,13 @@ def lambda_handler(event, context):
             }),
         }
     finally:
-        # Flush OTLP logs before Lambda freezes the execution environment
-        if logger_provider:
-            logger_provider.force_flush(timeout_millis=5000)
+        # Only flush when the invocation is about to run out of time; otherwise
+        # queued records ride along with the batch processor's schedule.
+        if logger_provider and context is not None:
+            remaining_ms = context.get_remaining_time_in_millis()
+            flush_ms = remaining_ms - OTEL_FLUSH_HEADROOM_MS
+            if remaining_ms < OTEL_FLUSH_REMAINING_MS and flush_ms > 0:
+                logger_provider.force_flush(timeout_millis=flush_ms)
 
 
 # ---------------------------------------------------------------------------
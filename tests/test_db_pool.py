@@ -0,0 +1,69 @@
+import pytest
+
+for _module in ("orjson", "psycopg2", "flask", "aws_lambda_wsgi"):
+    pytest.importorskip(_module)
+
+import main  # noqa: E402
+
+
+class FakePool:
+    fail = False
+
+    def __init__(self, **kwargs):
+        if FakePool.fail:
+            raise main.psycopg2.OperationalError("could not connect to server")
+        self.kwargs = kwargs
+        self.closed = False
+
+    def closeall(self):
+        if self.closed:
+            raise main.psycopg2.pool.PoolError("connection pool is closed")
+        self.closed = True
+
+
+@pytest.fixture
+def pool_state(monkeypatch):
+    config = {"host": "db", "port": 5432, "database": "books", "user": "u", "password": "a"}
+    monkeypatch.setattr(main.psycopg2.pool, "ThreadedConnectionPool", FakePool)
+    monkeypatch.setattr(main, "get_db_config", lambda: config)
+    monkeypatch.setattr(main, "_POOL", None)
+    monkeypatch.setattr(main, "_pool_config", None)
+    monkeypatch.setattr(FakePool, "fail", False)
+    return config
+
+
+def test_failed_rebuild_keeps_old_pool_and_retries(monkeypatch, pool_state):
+    old_pool = main.get_db_pool()
+
+    rotated = dict(pool_state, password="b")
+    monkeypatch.setattr(main, "get_db_config", lambda: rotated)
+    FakePool.fail = True
+    with pytest.raises(main.psycopg2.OperationalError):
+        main.get_db_pool()
+    assert main._POOL is old_pool
+    assert not old_pool.closed
+
+    FakePool.fail = False
+    new_pool = main.get_db_pool()
+    assert new_pool is not old_pool
+    assert new_pool.kwargs["password"] == "b"
+    assert old_pool.closed
+
+
+def test_secret_refresh_failure_keeps_cached_config(monkeypatch):
+    secret = {"host": "db", "port": 5432, "dbname": "books", "username": "u", "password": "a"}
+    monkeypatch.setattr(main, "db_config", None)
+    monkeypatch.setattr(main, "_db_secret_cache", (secret, 0.0))
+    monkeypatch.setattr(main, "_db_secret_expired", lambda: False)
+    config = main.get_db_config()
+
+    def unavailable(secret_id):
+        raise RuntimeError("Secrets Manager unreachable")
+
+    monkeypatch.setattr(main, "_db_secret_expired", lambda: True)
+    monkeypatch.setenv("DB_PASSWORD_SECRET", "books-db")
+    monkeypatch.setattr(main, "get_secret_string", unavailable)
+    before = main.time.monotonic()
+    assert main.get_db_config() is config
+    assert main._db_secret_cache[0] is secret
+    assert main._db_secret_cache[1] >= before